@@ -3,79 +3,109 @@
 Analyze Radiance geometry files to extract room dimensions and bounding box.
 """
 
+import mmap
+import os
 import re
 import numpy as np
 
+# Polygon header ("<modifier> polygon <id>") or coordinate line ("12 x1 y1 z1 ...")
+POLYGON_RE = re.compile(rb'^[ \t]*(?:(\S+)[ \t]+polygon[ \t]|(12[ \t][^\n]*))', re.M)
+
 def parse_radiance_polygon(line):
     """
     Parse a Radiance polygon definition line to extract coordinates.
     Format: "12 x1 y1 z1 x2 y2 z2 x3 y3 z3 x4 y4 z4"
+    Returns: numpy array of shape (N, 3) with the (x, y, z) vertices
     """
-    parts = line.strip().split()
-    if len(parts) < 13 or parts[0] != '12':
+    if not line.lstrip().startswith('12 '):
         return None
 
-    # Extract coordinates (skip first element which is '12')
-    coords = [float(x) for x in parts[1:]]
-
-    # Group into (x, y, z) tuples
-    vertices = []
-    for i in range(0, len(coords), 3):
-        if i+2 < len(coords):
-            vertices.append((coords[i], coords[i+1], coords[i+2]))
+    arr = np.fromstring(line, sep=' ', dtype=np.float64)
+    if arr.size < 13:
+        return None
 
-    return vertices
+    # Skip the leading count and group into (x, y, z) rows, dropping a
+    # partial trailing vertex
+    n = (arr.size - 1) // 3 * 3
+    return arr[1:1 + n].reshape(-1, 3)
 
 def analyze_geometry_file(filepath, material_filter=None):
     """
     Analyze a Radiance geometry file and extract all polygon vertices.
+    The file is memory-mapped and scanned once with a compiled regex.
     """
-    vertices = []
+    # One case-insensitive alternation for all filter substrings
+    filt_re = (re.compile(b'|'.join(re.escape(m.encode()) for m in material_filter), re.I)
+               if material_filter else None)
+    keep = filt_re is None
+
+    # A 0-byte file cannot be memory-mapped
+    if os.path.getsize(filepath) == 0:
+        return np.empty((0, 3), dtype=np.float64)
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Size the buffer for one quad per coordinate line; grown if a polygon has more vertices
+        n_coord_lines = len(re.findall(rb'^[ \t]*12[ \t]', mm, re.M))
+        vertices = np.empty((max(n_coord_lines, 1) * 4, 3), dtype=np.float64)
+        wi = 0
+
+        for match in POLYGON_RE.finditer(mm):
+            material, coords = match.groups()
+
+            # Material/object definition line; the filter is tested once per material
+            if material is not None:
+                keep = filt_re is None or filt_re.search(material) is not None
+
+            # Coordinate line; if filtering by material, check if it matches
+            elif keep:
+                verts = parse_radiance_polygon(coords.decode())
+                if verts is not None:
+                    n = len(verts)
+                    if wi + n > len(vertices):
+                        vertices = np.resize(vertices, (max(2 * len(vertices), wi + n), 3))
+                    vertices[wi:wi + n] = verts
+                    wi += n
+
+    return vertices[:wi]
+
+def analyze_geometry_file_grouped(filepath):
+    """
+    Scan a Radiance geometry file once and group polygon vertices by material.
+    Returns: dict mapping material name to an (N, 3) array of vertices
+    """
+    groups = {}
     current_material = None
 
-    with open(filepath, 'r') as f:
-        for line in f:
-            line = line.strip()
-
-            # Check if this is a material/object definition line
-            if ' polygon ' in line:
-                current_material = line.split()[0]
-
-            # Check if this is a coordinate line (starts with "12")
-            elif line.startswith('12 '):
-                # If filtering by material, check if it matches
-                if material_filter:
-                    if current_material and any(m.lower() in current_material.lower() for m in material_filter):
-                        verts = parse_radiance_polygon(line)
-                        if verts:
-                            vertices.extend(verts)
-                else:
-                    verts = parse_radiance_polygon(line)
-                    if verts:
-                        vertices.extend(verts)
-
-    return vertices
+    # A 0-byte file cannot be memory-mapped
+    if os.path.getsize(filepath) == 0:
+        return groups
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for match in POLYGON_RE.finditer(mm):
+            material, coords = match.groups()
+
+            # Material/object definition line
+            if material is not None:
+                current_material = material.decode()
+
+            # Coordinate line
+            else:
+                verts = parse_radiance_polygon(coords.decode())
+                if verts is not None:
+                    groups.setdefault(current_material, []).append(verts)
+
+    return {material: np.concatenate(verts, axis=0) for material, verts in groups.items()}
 
 def get_bounding_box(vertices):
     """
-    Calculate bounding box from list of (x, y, z) vertices.
+    Calculate bounding box from an (N, 3) array of (x, y, z) vertices.
+    Returns: (2, 3) array where bbox[0] is the min and bbox[1] the max (x, y, z)
     """
-    if not vertices:
+    if len(vertices) == 0:
         return None
 
-    vertices = np.array(vertices)
-
-    min_coords = vertices.min(axis=0)
-    max_coords = vertices.max(axis=0)
-
-    return {
-        'min_x': min_coords[0],
-        'max_x': max_coords[0],
-        'min_y': min_coords[1],
-        'max_y': max_coords[1],
-        'min_z': min_coords[2],
-        'max_z': max_coords[2]
-    }
+    arr = np.asarray(vertices)
+    return np.stack([arr.min(axis=0), arr.max(axis=0)])
 
 def analyze_room_geometry(scene_file, glazing_file):
     """
@@ -87,21 +117,25 @@ def analyze_room_geometry(scene_file, glazing_file):
     print()
 
     # Analyze floor polygons (PISO material)
+    # Scan the scene once; floor and complete-room views are derived from it
+    groups = analyze_geometry_file_grouped(scene_file)
+
     print("Analyzing floor polygons (PISO material)...")
-    floor_vertices = analyze_geometry_file(scene_file, material_filter=['PISO', 'piso'])
+    floor_groups = [v for m, v in groups.items() if m and 'piso' in m.lower()]
+    floor_vertices = np.vstack(floor_groups) if floor_groups else np.empty((0, 3))
 
-    if floor_vertices:
+    if len(floor_vertices) > 0:
         floor_bbox = get_bounding_box(floor_vertices)
         print(f"  Found {len(floor_vertices)} floor vertices")
         print(f"  Floor bounding box:")
-        print(f"    X: {floor_bbox['min_x']:.3f} to {floor_bbox['max_x']:.3f} m")
-        print(f"    Y: {floor_bbox['min_y']:.3f} to {floor_bbox['max_y']:.3f} m")
-        print(f"    Z: {floor_bbox['min_z']:.3f} to {floor_bbox['max_z']:.3f} m")
+        print(f"    X: {floor_bbox[0, 0]:.3f} to {floor_bbox[1, 0]:.3f} m")
+        print(f"    Y: {floor_bbox[0, 1]:.3f} to {floor_bbox[1, 1]:.3f} m")
+        print(f"    Z: {floor_bbox[0, 2]:.3f} to {floor_bbox[1, 2]:.3f} m")
         print()
 
         # Calculate floor dimensions
-        floor_length = floor_bbox['max_x'] - floor_bbox['min_x']
-        floor_width = floor_bbox['max_y'] - floor_bbox['min_y']
+        floor_length = floor_bbox[1, 0] - floor_bbox[0, 0]
+        floor_width = floor_bbox[1, 1] - floor_bbox[0, 1]
         floor_area = floor_length * floor_width
 
         print(f"Floor dimensions:")
@@ -116,18 +150,18 @@ def analyze_room_geometry(scene_file, glazing_file):
 
     # Analyze all scene geometry to get room height
     print("Analyzing complete room geometry...")
-    all_vertices = analyze_geometry_file(scene_file)
+    all_vertices = np.vstack(list(groups.values())) if groups else np.empty((0, 3))
 
-    if all_vertices:
+    if len(all_vertices) > 0:
         room_bbox = get_bounding_box(all_vertices)
         print(f"  Found {len(all_vertices)} total vertices in scene")
         print(f"  Complete room bounding box:")
-        print(f"    X: {room_bbox['min_x']:.3f} to {room_bbox['max_x']:.3f} m")
-        print(f"    Y: {room_bbox['min_y']:.3f} to {room_bbox['max_y']:.3f} m")
-        print(f"    Z: {room_bbox['min_z']:.3f} to {room_bbox['max_z']:.3f} m")
+        print(f"    X: {room_bbox[0, 0]:.3f} to {room_bbox[1, 0]:.3f} m")
+        print(f"    Y: {room_bbox[0, 1]:.3f} to {room_bbox[1, 1]:.3f} m")
+        print(f"    Z: {room_bbox[0, 2]:.3f} to {room_bbox[1, 2]:.3f} m")
         print()
 
-        room_height = room_bbox['max_z'] - room_bbox['min_z']
+        room_height = room_bbox[1, 2] - room_bbox[0, 2]
         print(f"Room height: {room_height:.3f} m")
         print()
     else:
@@ -139,17 +173,17 @@ def analyze_room_geometry(scene_file, glazing_file):
     print("Analyzing glazing geometry...")
     glazing_vertices = analyze_geometry_file(glazing_file)
 
-    if glazing_vertices:
+    if len(glazing_vertices) > 0:
         glazing_bbox = get_bounding_box(glazing_vertices)
         print(f"  Found {len(glazing_vertices)} glazing vertices")
         print(f"  Glazing bounding box:")
-        print(f"    X: {glazing_bbox['min_x']:.3f} to {glazing_bbox['max_x']:.3f} m")
-        print(f"    Y: {glazing_bbox['min_y']:.3f} to {glazing_bbox['max_y']:.3f} m")
-        print(f"    Z: {glazing_bbox['min_z']:.3f} to {glazing_bbox['max_z']:.3f} m")
+        print(f"    X: {glazing_bbox[0, 0]:.3f} to {glazing_bbox[1, 0]:.3f} m")
+        print(f"    Y: {glazing_bbox[0, 1]:.3f} to {glazing_bbox[1, 1]:.3f} m")
+        print(f"    Z: {glazing_bbox[0, 2]:.3f} to {glazing_bbox[1, 2]:.3f} m")
         print()
 
         # Estimate window sill height (minimum Z of glazing)
-        window_sill_height = glazing_bbox['min_z']
+        window_sill_height = glazing_bbox[0, 2]
         print(f"Window sill height: {window_sill_height:.3f} m")
         print()
     else:
@@ -166,9 +200,9 @@ def analyze_room_geometry(scene_file, glazing_file):
     # Standard work plane heights
     work_plane_height = 0.75  # Default for office spaces (0.75m or 0.8m typical)
 
-    if floor_bbox:
+    if floor_bbox is not None:
         # Work plane is typically 0.75m above the floor
-        work_plane_z = floor_bbox['min_z'] + work_plane_height
+        work_plane_z = floor_bbox[0, 2] + work_plane_height
 
         print(f"Recommended work plane height: {work_plane_height:.2f} m above floor")
         print(f"Work plane Z-coordinate: {work_plane_z:.3f} m")
@@ -183,7 +217,7 @@ def analyze_room_geometry(scene_file, glazing_file):
         total_sensors = nx * ny
 
         print(f"Sensor grid parameters (spacing: {spacing} m):")
-        print(f"  Grid origin: ({floor_bbox['min_x']:.3f}, {floor_bbox['min_y']:.3f}, {work_plane_z:.3f})")
+        print(f"  Grid origin: ({floor_bbox[0, 0]:.3f}, {floor_bbox[0, 1]:.3f}, {work_plane_z:.3f})")
         print(f"  Grid dimensions: {nx} x {ny} sensors")
         print(f"  Total sensor points: {total_sensors}")
         print(f"  Coverage area: {floor_area:.2f} m²")
@@ -201,7 +235,7 @@ def analyze_room_geometry(scene_file, glazing_file):
         print(f"# Work plane height: {work_plane_height} m")
         print(f"#")
         print(f"# Grid parameters:")
-        print(f"#   Origin: ({floor_bbox['min_x']:.3f}, {floor_bbox['min_y']:.3f}, {work_plane_z:.3f})")
+        print(f"#   Origin: ({floor_bbox[0, 0]:.3f}, {floor_bbox[0, 1]:.3f}, {work_plane_z:.3f})")
         print(f"#   X-direction: {floor_length:.3f} m, {nx} points")
         print(f"#   Y-direction: {floor_width:.3f} m, {ny} points")
         print(f"#   Total points: {total_sensors}")
@@ -214,7 +248,7 @@ def analyze_room_geometry(scene_file, glazing_file):
             'floor_length': floor_length,
             'floor_width': floor_width,
             'floor_area': floor_area,
-            'room_height': room_height if room_bbox else None,
+            'room_height': room_height if room_bbox is not None else None,
             'work_plane_height': work_plane_height,
             'work_plane_z': work_plane_z,
             'sensor_spacing': spacing,
@@ -9,45 +9,68 @@ import numpy as np
 from pathlib import Path
 
 def parse_polygon(line):
-    """Parse a Radiance polygon coordinate line."""
+    """Parse a Radiance polygon coordinate line into a (V, 3) vertex array."""
     # Format: 12 x1 y1 z1 x2 y2 z2 x3 y3 z3 x4 y4 z4
-    parts = line.strip().split()
-    if parts[0] != '12':
+    if not line.lstrip().startswith('12 '):
         return None
 
-    coords = [float(x) for x in parts[1:]]
-    # Extract x, y coordinates (every 3rd value starting from 0 and 1)
-    x_coords = [coords[i] for i in range(0, len(coords), 3)]
-    y_coords = [coords[i] for i in range(1, len(coords), 3)]
-    z_coords = [coords[i] for i in range(2, len(coords), 3)]
-
-    return {
-        'x': x_coords,
-        'y': y_coords,
-        'z': z_coords
-    }
-
-def get_polygon_bounds(polygon):
-    """Get bounding box of a polygon."""
-    return {
-        'x_min': min(polygon['x']),
-        'x_max': max(polygon['x']),
-        'y_min': min(polygon['y']),
-        'y_max': max(polygon['y']),
-        'z': polygon['z'][0]  # Assume floor is flat
-    }
-
-def polygon_area(polygon):
-    """Calculate area of polygon using shoelace formula."""
-    x = polygon['x']
-    y = polygon['y']
-    n = len(x)
-    area = 0.0
-    for i in range(n):
-        j = (i + 1) % n
-        area += x[i] * y[j]
-        area -= x[j] * y[i]
-    return abs(area) / 2.0
+    arr = np.fromstring(line, sep=' ', dtype=np.float64)
+    # Skip the leading count and group into (x, y, z) rows
+    return arr[1:].reshape(-1, 3)
+
+def get_polygon_bounds(polygons):
+    """Get bounding boxes of (P, V, 3) polygons as (mins, maxs), each (P, 3)."""
+    return polygons.min(axis=1), polygons.max(axis=1)
+
+def batched_shoelace(xy):
+    """
+    Calculate areas of P polygons with V vertices each in one call.
+    xy: array of shape (P, V, 2) with the (x, y) vertex coordinates
+    """
+    x = xy[..., 0]
+    y = xy[..., 1]
+    cross = x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y
+    return np.abs(cross.sum(axis=1)) / 2.0
+
+def read_floor_polygons(lines, headers):
+    """
+    Collect the quad polygons following each header into a (P, 4, 3) array.
+    headers maps a result key to its header, e.g. {'corridor': 'PISO-PASILLOIER polygon'}
+    """
+    # Pass 1: find the coordinate line belonging to each matching header
+    coord_lines = {key: [] for key in headers}
+    current_material = None
+    for line in lines:
+        key = next((k for k, header in headers.items() if header in line), None)
+        if key:
+            current_material = key
+        elif line.strip().startswith('12 ') and current_material:
+            coord_lines[current_material].append(line)
+            current_material = None
+
+    # Pass 2: parse straight into preallocated arrays
+    polygons = {}
+    for key, found in coord_lines.items():
+        arr = np.empty((len(found), 4, 3), dtype=np.float64)
+        for i, line in enumerate(found):
+            arr[i] = parse_polygon(line)
+        polygons[key] = arr
+
+    return polygons
+
+def format_polygons(polygons, areas, show_z=True):
+    """Format per-polygon bounds and areas as one report string."""
+    mins, maxs = get_polygon_bounds(polygons)
+    report = []
+    for i, (mn, mx, area) in enumerate(zip(mins, maxs, areas)):
+        report.append(f"\n  Polygon {i}:\n")
+        report.append(f"    X range: {mn[0]:.3f} to {mx[0]:.3f} m\n")
+        report.append(f"    Y range: {mn[1]:.3f} to {mx[1]:.3f} m\n")
+        if show_z:
+            # Assume floor is flat
+            report.append(f"    Z level: {polygons[i, 0, 2]:.6f} m\n")
+        report.append(f"    Area: {area:.2f} m²\n")
+    return ''.join(report)
 
 def main():
     scene_file = Path('/Users/gbv/radiance_claude/edificio/objects/scene.geom')
@@ -56,23 +79,12 @@ def main():
     with open(scene_file, 'r') as f:
         lines = f.readlines()
 
-    main_floor_polys = []
-    corridor_polys = []
-
-    current_material = None
-    for i, line in enumerate(lines):
-        if 'PISO-CONCRETO-PULIDOIER polygon' in line:
-            current_material = 'main'
-        elif 'PISO-PASILLOIER polygon' in line:
-            current_material = 'corridor'
-        elif line.strip().startswith('12 ') and current_material:
-            poly = parse_polygon(line)
-            if poly:
-                if current_material == 'main':
-                    main_floor_polys.append(poly)
-                else:
-                    corridor_polys.append(poly)
-            current_material = None
+    polygons = read_floor_polygons(lines, {
+        'main': 'PISO-CONCRETO-PULIDOIER polygon',
+        'corridor': 'PISO-PASILLOIER polygon',
+    })
+    main_floor_polys = polygons['main']
+    corridor_polys = polygons['corridor']
 
     print("=" * 80)
     print("FLOOR GEOMETRY ANALYSIS")
@@ -82,26 +94,13 @@ def main():
     print(f"\nMAIN ROOM FLOOR (PISO-CONCRETO-PULIDOIER):")
     print(f"  Number of polygons: {len(main_floor_polys)}")
 
-    if main_floor_polys:
-        all_x = []
-        all_y = []
-        total_area = 0
-
-        for i, poly in enumerate(main_floor_polys):
-            bounds = get_polygon_bounds(poly)
-            area = polygon_area(poly)
-            total_area += area
-            all_x.extend(poly['x'])
-            all_y.extend(poly['y'])
+    if len(main_floor_polys):
+        areas = batched_shoelace(main_floor_polys[..., :2])
+        total_area = areas.sum()
+        print(format_polygons(main_floor_polys, areas), end='')
 
-            print(f"\n  Polygon {i}:")
-            print(f"    X range: {bounds['x_min']:.3f} to {bounds['x_max']:.3f} m")
-            print(f"    Y range: {bounds['y_min']:.3f} to {bounds['y_max']:.3f} m")
-            print(f"    Z level: {bounds['z']:.6f} m")
-            print(f"    Area: {area:.2f} m²")
-
-        main_x_min, main_x_max = min(all_x), max(all_x)
-        main_y_min, main_y_max = min(all_y), max(all_y)
+        main_x_min, main_x_max = main_floor_polys[..., 0].min(), main_floor_polys[..., 0].max()
+        main_y_min, main_y_max = main_floor_polys[..., 1].min(), main_floor_polys[..., 1].max()
 
         print(f"\n  MAIN ROOM BOUNDS:")
         print(f"    X: {main_x_min:.3f} to {main_x_max:.3f} m (width: {main_x_max - main_x_min:.3f} m)")
@@ -112,29 +111,17 @@ def main():
     print(f"\nCORRIDOR FLOOR (PISO-PASILLOIER):")
     print(f"  Number of polygons: {len(corridor_polys)}")
 
-    if corridor_polys:
-        all_x = []
-        all_y = []
-        total_area = 0
-
-        for i, poly in enumerate(corridor_polys):
-            bounds = get_polygon_bounds(poly)
-            area = polygon_area(poly)
-            total_area += area
-            all_x.extend(poly['x'])
-            all_y.extend(poly['y'])
-
-            if i < 3:  # Show first few
-                print(f"\n  Polygon {i}:")
-                print(f"    X range: {bounds['x_min']:.3f} to {bounds['x_max']:.3f} m")
-                print(f"    Y range: {bounds['y_min']:.3f} to {bounds['y_max']:.3f} m")
-                print(f"    Area: {area:.2f} m²")
+    if len(corridor_polys):
+        areas = batched_shoelace(corridor_polys[..., :2])
+        total_area = areas.sum()
+        # Show first few
+        print(format_polygons(corridor_polys[:3], areas[:3], show_z=False), end='')
 
         if len(corridor_polys) > 3:
             print(f"  ... and {len(corridor_polys) - 3} more polygons")
 
-        corr_x_min, corr_x_max = min(all_x), max(all_x)
-        corr_y_min, corr_y_max = min(all_y), max(all_y)
+        corr_x_min, corr_x_max = corridor_polys[..., 0].min(), corridor_polys[..., 0].max()
+        corr_y_min, corr_y_max = corridor_polys[..., 1].min(), corridor_polys[..., 1].max()
 
         print(f"\n  CORRIDOR BOUNDS:")
         print(f"    X: {corr_x_min:.3f} to {corr_x_max:.3f} m (width: {corr_x_max - corr_x_min:.3f} m)")
@@ -146,7 +133,7 @@ def main():
     print("COMPARISON & RECOMMENDATIONS")
     print("=" * 80)
 
-    if main_floor_polys and corridor_polys:
+    if len(main_floor_polys) and len(corridor_polys):
         print("\nThe building contains TWO DISTINCT SPACES:")
         print(f"  1. Main room: {main_x_max - main_x_min:.2f}m × {main_y_max - main_y_min:.2f}m")
         print(f"  2. Corridor: {corr_x_max - corr_x_min:.2f}m × {corr_y_max - corr_y_min:.2f}m")
@@ -158,7 +145,7 @@ def main():
 
     print("\nRECOMMENDED SENSOR GRID BOUNDARIES:")
     print("\nOption 1: MAIN ROOM ONLY (most common for daylighting analysis)")
-    if main_floor_polys:
+    if len(main_floor_polys):
         # Add 0.5m offset from walls
         offset = 0.5
         print(f"  X: {main_x_min + offset:.3f} to {main_x_max - offset:.3f} m")
@@ -167,7 +154,7 @@ def main():
         print(f"  At 0.5m spacing: ~{int((main_x_max - main_x_min - 2*offset)/0.5) * int((main_y_max - main_y_min - 2*offset)/0.5)} sensors")
 
     print("\nOption 2: BOTH SPACES (if corridor daylighting is important)")
-    if main_floor_polys and corridor_polys:
+    if len(main_floor_polys) and len(corridor_polys):
         combined_x_min = min(main_x_min, corr_x_min)
         combined_x_max = max(main_x_max, corr_x_max)
         combined_y_min = min(main_y_min, corr_y_min)
@@ -7,8 +7,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as colors
 from datetime import datetime
+import multiprocessing
 import os
 
+from ill_io import load_annual_ill
+
 # Room and sensor grid parameters (main room only)
 MIN_X = 0.558644626504064
 MAX_X = 8.218644626504070
@@ -17,41 +20,15 @@ MAX_Y = -0.183275049526670
 nx = 20
 ny = 24
 
-def parse_annual_ill_file(filepath):
-    """Parse the annual.ill file"""
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-
-    skip_keywords = ['#', 'NCOMP', 'NROWS', 'NCOLS', 'FORMAT', 'SOFTWARE',
-                     'CAPDATE', 'GMT', 'rmtxop', 'dctimestep', 'Applied',
-                     'Transposed', 'LATLONG']
-
-    data_start = 0
-    for i, line in enumerate(lines):
-        is_header = False
-        for keyword in skip_keywords:
-            if line.startswith(keyword):
-                is_header = True
-                break
-        if not is_header and line.strip():
-            data_start = i
-            break
-
-    data = []
-    for line in lines[data_start:]:
-        if line.strip():
-            try:
-                values = [float(x) for x in line.split()]
-                if len(values) > 0:
-                    data.append(values)
-            except ValueError:
-                continue
-
-    return np.array(data)
-
-def datetime_to_hour_of_year(dt, year=2024):
+# Hours plotted for each day (9 to 17)
+HOURS = list(range(9, 18))
+
+# Days elapsed before the first of each month in 2024 (leap year)
+_CUMDAYS_2024 = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335)
+
+def datetime_to_hour_of_year(dt):
     """
-    Convert datetime to hour of year index (0-8759).
+    Convert a 2024 datetime to hour of year index (0-8759).
 
     The WEA/annual.ill format uses intervals where hour H.5 represents
     the interval from H:00 to (H+1):00, centered at H:30.
@@ -59,52 +36,36 @@ def datetime_to_hour_of_year(dt, year=2024):
     To get illuminance AT time H:00, we use the interval ending at H:00,
     which is row (H-1) representing (H-1):00 to H:00.
     """
-    start_of_year = datetime(year, 1, 1, 0, 0, 0)
-    target_dt = datetime(year, dt.month, dt.day, dt.hour, 0, 0)
-    delta = target_dt - start_of_year
-    hour_of_year = int(delta.total_seconds() / 3600)
-    return max(0, hour_of_year - 1)
+    return max(0, _CUMDAYS_2024[dt.month - 1] * 24 + (dt.day - 1) * 24 + dt.hour - 1)
 
 def create_grid_coordinates():
-    """Create X, Y meshgrid for sensor positions"""
-    width = MAX_X - MIN_X
-    depth = MAX_Y - MIN_Y
-    spacing_x = width / (nx - 1)
-    spacing_y = depth / (ny - 1)
-
-    x_coords = []
-    y_coords = []
-
-    for ix in range(nx):
-        x = MIN_X + ix * spacing_x
-        for iy in range(ny):
-            y = MIN_Y + iy * spacing_y
-            x_coords.append(x)
-            y_coords.append(y)
-
-    return np.array(x_coords), np.array(y_coords)
-
-def reshape_to_grid(illuminance_values, x_coords, y_coords):
-    """Reshape 1D illuminance values into 2D grid"""
-    x_unique = np.unique(x_coords)
-    y_unique = np.unique(y_coords)
-    nx_local = len(x_unique)
-    ny_local = len(y_unique)
-
-    grid = np.full((ny_local, nx_local), np.nan)
+    """
+    Create X, Y sensor positions (X-major, iy varies fastest) together
+    with the 1D axis positions xs (nx,) and ys (ny,)
+    """
+    xs = np.linspace(MIN_X, MAX_X, nx)
+    ys = np.linspace(MIN_Y, MAX_Y, ny)
+    XX, YY = np.meshgrid(xs, ys, indexing='ij')
+    return XX.ravel(), YY.ravel(), xs, ys
 
-    for i, (x, y, val) in enumerate(zip(x_coords, y_coords, illuminance_values)):
-        ix = np.argmin(np.abs(x_unique - x))
-        iy = np.argmin(np.abs(y_unique - y))
-        grid[iy, ix] = val
+def reshape_to_grid_into(illuminance_values, grid):
+    """
+    Write 1D illuminance values in place into a preallocated (ny, nx) grid
+    indexed as grid[iy, ix].
 
-    return grid, x_unique, y_unique
+    create_grid_coordinates emits sensors X-major (iy varies fastest),
+    so this is a plain reshape to (nx, ny) followed by a transpose.
+    """
+    np.copyto(grid, illuminance_values.reshape(nx, ny).T)
+    return grid
 
-def create_single_day_figure(data, x_coords, y_coords, month, day, label, output_file):
+def create_single_day_figure(slab, mins, maxs, means, xs, ys, label, output_file):
     """
     Create a 3x3 grid figure for a single day showing hours 9-17
+
+    slab holds one row of sensor values per hour in HOURS; mins, maxs and
+    means are the matching per-hour statistics; xs and ys are the grid axes.
     """
-    hours = list(range(9, 18))  # 9 to 17
     n_rows = 3
     n_cols = 3
 
@@ -113,50 +74,43 @@ def create_single_day_figure(data, x_coords, y_coords, month, day, label, output
     niveles = [0, 299, 500, 1000, 1500, 2000, 3000,
                4000, 5000, 6000, 7000, 8000, 10000]
 
-    for idx, hour in enumerate(hours):
-        row = idx // n_cols
-        col = idx % n_cols
-        ax = axes[row, col]
+    # Shared color mapping for all subplots and the colorbar
+    cmap = plt.cm.jet
+    norm = colors.Normalize(vmin=niveles[0], vmax=niveles[-1])
 
-        # Get hour of year
-        dt = datetime(2024, month, day, hour)
-        hour_of_year = datetime_to_hour_of_year(dt)
+    # Grid geometry is the same for every hour
+    XX, YY = np.meshgrid(xs, ys)
 
-        # Get illuminance values
-        illuminance_values = data[hour_of_year, :]
+    # Rotate 90 counter-clockwise
+    Xr = -YY
+    Yr = XX
 
-        # Reshape to grid
-        grid, x_unique, y_unique = reshape_to_grid(illuminance_values, x_coords, y_coords)
+    grid = np.empty((len(ys), len(xs)), dtype=slab.dtype)
 
-        # Create meshgrid
-        XX, YY = np.meshgrid(x_unique, y_unique)
-        ZZ = grid
+    for idx, hour in enumerate(HOURS):
+        row = idx // n_cols
+        col = idx % n_cols
+        ax = axes[row, col]
 
-        # Rotate 90 counter-clockwise
-        Xr = -YY
-        Yr = XX
+        # Reshape to grid
+        reshape_to_grid_into(slab[idx], grid)
 
         # Plot
-        contour_filled = ax.contourf(Xr, Yr, ZZ, cmap='jet', alpha=0.7,
+        contour_filled = ax.contourf(Xr, Yr, grid, cmap=cmap, norm=norm, alpha=0.7,
                                      levels=niveles, extend='max')
-        contour_lines = ax.contour(Xr, Yr, ZZ, colors='black',
+        contour_lines = ax.contour(Xr, Yr, grid, colors='black',
                                    levels=niveles, linewidths=0.5)
-        ax.clabel(contour_lines, inline=True, fontsize=7, fmt='%g')
+        ax.clabel(contour_lines, levels=niveles[::3], inline=True, fontsize=7, fmt='%g')
 
         ax.set_aspect('equal', adjustable='box')
         ax.tick_params(labelsize=8)
         ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
 
-        # Stats
-        min_lux = np.nanmin(illuminance_values)
-        max_lux = np.nanmax(illuminance_values)
-        mean_lux = np.nanmean(illuminance_values)
-
         # Title for each subplot
         ax.set_title(f'{hour}:00', fontsize=12, fontweight='bold')
 
         # Stats text box
-        stats_text = f'Min: {min_lux:.0f}\nMax: {max_lux:.0f}\nMean: {mean_lux:.0f}'
+        stats_text = f'Min: {mins[idx]:.0f}\nMax: {maxs[idx]:.0f}\nMean: {means[idx]:.0f}'
         ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
                 fontsize=8, verticalalignment='top',
                 bbox=dict(boxstyle='round', facecolor='white', alpha=0.85, edgecolor='gray'))
@@ -181,32 +135,50 @@ def create_single_day_figure(data, x_coords, y_coords, month, day, label, output
     fig.text(0.02, 0.02, 'North: ← (left)', fontsize=9,
              bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.9))
 
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    # PNG encoding goes through Pillow; fast zlib level since encode time
+    # dominates at this size (pillow-simd is a drop-in, faster replacement)
+    plt.savefig(output_file, dpi=300, bbox_inches='tight',
+                pil_kwargs={'compress_level': 1, 'optimize': False})
     print(f"Figure saved to: {output_file}")
     plt.close()
 
+def render_day(args):
+    """Pool worker: render one day's figure from a picklable argument tuple."""
+    create_single_day_figure(*args)
+
 def main():
     # Load data
     print("Loading annual illuminance data...")
-    data = parse_annual_ill_file('results/dc/annual.ill')
+    data = load_annual_ill('results/dc/annual.ill')
     print(f"Data shape: {data.shape}")
 
     # Create grid coordinates
-    x_coords, y_coords = create_grid_coordinates()
+    _, _, xs, ys = create_grid_coordinates()
+
+    # Gather all plotted hours of both days into one (days, hours, sensors) slab
+    days = [(6, 26), (11, 20)]
+    hours_of_year = np.fromiter(
+        (datetime_to_hour_of_year(datetime(2024, m, d, h)) for m, d in days for h in HOURS),
+        dtype=np.int32, count=len(days) * len(HOURS))
+    slab = data[hours_of_year].reshape(len(days), len(HOURS), -1)
+
+    # Sensor rows carry no NaNs, so plain reductions are enough
+    mins = slab.min(axis=2)
+    maxs = slab.max(axis=2)
+    means = slab.mean(axis=2)
 
     os.makedirs('images', exist_ok=True)
 
-    # Create separate figure for June 26
-    print("\nGenerating June 26 grid...")
-    create_single_day_figure(data, x_coords, y_coords,
-                             month=6, day=26, label='June 26, 2024',
-                             output_file='images/jun26_hourly_grid.png')
-
-    # Create separate figure for November 20
-    print("\nGenerating November 20 grid...")
-    create_single_day_figure(data, x_coords, y_coords,
-                             month=11, day=20, label='November 20, 2024',
-                             output_file='images/nov20_hourly_grid.png')
+    # One figure per day; the slabs are small, so workers get them directly
+    labels = ['June 26, 2024', 'November 20, 2024']
+    output_files = ['images/jun26_hourly_grid.png', 'images/nov20_hourly_grid.png']
+    jobs = [(slab[i], mins[i], maxs[i], means[i], xs, ys, labels[i], output_files[i])
+            for i in range(len(days))]
+
+    # Render both days in separate processes (Agg rendering is not thread-safe)
+    print("\nGenerating June 26 and November 20 grids...")
+    with multiprocessing.Pool(len(jobs)) as pool:
+        pool.map(render_day, jobs)
 
     print("\nDone!")
 
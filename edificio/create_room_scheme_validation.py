@@ -10,41 +10,35 @@ Create room scheme diagram showing:
 Output: images/room_scheme_validation.png
 """
 
+import matplotlib
+matplotlib.use('Agg')  # file output only; skip GUI backend setup
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import Rectangle, FancyBboxPatch
+from matplotlib.patches import Rectangle, FancyBboxPatch, PathPatch
+from matplotlib.path import Path as MplPath
+from matplotlib.collections import LineCollection, PolyCollection
 import numpy as np
-import os
+import functools
+import logging
+from pathlib import Path
+
+from geometry import ROOM
+
+log = logging.getLogger(__name__)
 
 # Room dimensions (from geometry)
-ROOM_MIN_X = 0.458644626504064   # East wall
-ROOM_MAX_X = 8.31864462650407    # West wall
-ROOM_MIN_Y = -9.65327504952668   # South wall
-ROOM_MAX_Y = -0.0832750495266698 # North wall
-
-ROOM_WIDTH = ROOM_MAX_X - ROOM_MIN_X   # ~7.86m (E-W)
-ROOM_DEPTH = ROOM_MAX_Y - ROOM_MIN_Y   # ~9.57m (N-S)
-
-# Window positions from glazing.geom
-# North wall windows (Y ≈ 0.117): X ranges from 1.06 to 6.56
-NORTH_WINDOWS = [
-    (1.05964463, 2.15764463),  # Window 1
-    (2.15964463, 3.25764463),  # Window 2
-    (3.25964463, 4.35764463),  # Window 3
-    (4.35964463, 5.45764463),  # Window 4
-    (5.45964463, 6.55764463),  # Window 5
-]
-NORTH_WALL_Y = -0.0832750495266698
-
-# South wall windows (Y ≈ -9.853): X ranges from 1.06 to 6.56
-SOUTH_WINDOWS = [
-    (1.05964463, 2.15764463),  # Window 1
-    (2.15964463, 3.25764463),  # Window 2
-    (3.25964463, 4.35764463),  # Window 3
-    (4.35964463, 5.45764463),  # Window 4
-    (5.45964463, 6.55764463),  # Window 5
-]
-SOUTH_WALL_Y = -9.65327504952668
+ROOM_MIN_X = ROOM.min_x   # East wall
+ROOM_MAX_X = ROOM.max_x   # West wall
+ROOM_MIN_Y = ROOM.min_y   # South wall
+ROOM_MAX_Y = ROOM.max_y   # North wall
+
+ROOM_WIDTH = ROOM.width   # ~7.86m (E-W)
+ROOM_DEPTH = ROOM.depth   # ~9.57m (N-S)
+
+# Window X ranges from glazing.geom (1.06 to 6.56), shared by both walls
+WINDOWS_X = ROOM.windows_x
+NORTH_WALL_Y = ROOM.max_y
+SOUTH_WALL_Y = ROOM.min_y
 
 # Door on east wall (typical location - assumed based on building conventions)
 DOOR_Y_START = -6.0
@@ -61,10 +55,39 @@ START_X = ROOM_MIN_X + OFFSET_EAST
 START_Y = ROOM_MIN_Y + OFFSET_SOUTH
 
 
-def create_room_scheme():
-    """Create the room scheme diagram"""
+@functools.lru_cache(maxsize=1)
+def _specs_text(nx, ny, spacing, offset_east, offset_south):
+    """Build the grid specifications text box contents"""
+    return (
+        f"Validation Grid Specifications:\n"
+        f"  Points X (E→W): {nx}\n"
+        f"  Points Y (N↔S): {ny}\n"
+        f"  Total sensors: {nx*ny}\n"
+        f"  Spacing: {spacing} m\n"
+        f"  Height: {ROOM.work_plane_z} m\n"
+        f"\nWall offsets:\n"
+        f"  From East: {offset_east} m\n"
+        f"  From South: {offset_south} m\n"
+        f"  To West: 0.68 m\n"
+        f"  To North: 0.51 m"
+    )
+
 
-    fig, ax = plt.subplots(figsize=(14, 16))
+def create_room_scheme(dpi=150, figsize=(14, 16), fig=None):
+    """
+    Create the room scheme diagram
+
+    dpi and figsize set the raster size; axis limits are fixed, so the
+    figure is saved as laid out without a tight-bbox pass. Pass fig to
+    redraw into an existing figure (it is cleared and left open) instead
+    of allocating a new one per call.
+    """
+
+    own_fig = fig is None
+    if own_fig:
+        fig = plt.figure(figsize=figsize)
+    fig.clear()
+    ax = fig.add_subplot(111)
 
     # Draw room outline
     room_rect = Rectangle(
@@ -77,41 +100,30 @@ def create_room_scheme():
     # Draw walls as thick lines
     wall_width = 0.15
 
-    # North wall (with windows)
-    ax.fill([ROOM_MIN_X - wall_width, ROOM_MAX_X + wall_width, ROOM_MAX_X + wall_width, ROOM_MIN_X - wall_width],
-            [ROOM_MAX_Y, ROOM_MAX_Y, ROOM_MAX_Y + wall_width, ROOM_MAX_Y + wall_width],
-            color='#808080', label='Walls')
-
-    # South wall (with windows)
-    ax.fill([ROOM_MIN_X - wall_width, ROOM_MAX_X + wall_width, ROOM_MAX_X + wall_width, ROOM_MIN_X - wall_width],
-            [ROOM_MIN_Y, ROOM_MIN_Y, ROOM_MIN_Y - wall_width, ROOM_MIN_Y - wall_width],
-            color='#808080')
-
-    # East wall (with door)
-    ax.fill([ROOM_MIN_X - wall_width, ROOM_MIN_X, ROOM_MIN_X, ROOM_MIN_X - wall_width],
-            [ROOM_MIN_Y - wall_width, ROOM_MIN_Y - wall_width, ROOM_MAX_Y + wall_width, ROOM_MAX_Y + wall_width],
-            color='#808080')
-
-    # West wall
-    ax.fill([ROOM_MAX_X, ROOM_MAX_X + wall_width, ROOM_MAX_X + wall_width, ROOM_MAX_X],
-            [ROOM_MIN_Y - wall_width, ROOM_MIN_Y - wall_width, ROOM_MAX_Y + wall_width, ROOM_MAX_Y + wall_width],
-            color='#808080')
-
-    # Draw north wall windows (cyan/blue)
-    for x_start, x_end in NORTH_WINDOWS:
-        window = Rectangle(
-            (x_start, ROOM_MAX_Y - 0.05), x_end - x_start, 0.20,
-            linewidth=2, edgecolor='blue', facecolor='#87CEEB', alpha=0.8
-        )
-        ax.add_patch(window)
-
-    # Draw south wall windows (cyan/blue)
-    for x_start, x_end in SOUTH_WINDOWS:
-        window = Rectangle(
-            (x_start, ROOM_MIN_Y - 0.15), x_end - x_start, 0.20,
-            linewidth=2, edgecolor='blue', facecolor='#87CEEB', alpha=0.8
-        )
-        ax.add_patch(window)
+    # Walls as one compound path: outer loop with the room floor as a hole
+    # (reverse winding on the inner loop makes it unfilled)
+    outer = np.array([[ROOM_MIN_X - wall_width, ROOM_MIN_Y - wall_width],
+                      [ROOM_MAX_X + wall_width, ROOM_MIN_Y - wall_width],
+                      [ROOM_MAX_X + wall_width, ROOM_MAX_Y + wall_width],
+                      [ROOM_MIN_X - wall_width, ROOM_MAX_Y + wall_width],
+                      [ROOM_MIN_X - wall_width, ROOM_MIN_Y - wall_width]])
+    inner = np.array([[ROOM_MIN_X, ROOM_MIN_Y],
+                      [ROOM_MIN_X, ROOM_MAX_Y],
+                      [ROOM_MAX_X, ROOM_MAX_Y],
+                      [ROOM_MAX_X, ROOM_MIN_Y],
+                      [ROOM_MIN_X, ROOM_MIN_Y]])
+    loop_codes = [MplPath.MOVETO, MplPath.LINETO, MplPath.LINETO, MplPath.LINETO, MplPath.CLOSEPOLY]
+    walls = MplPath(np.concatenate([outer, inner]), loop_codes * 2)
+    ax.add_patch(PathPatch(walls, facecolor='#808080', edgecolor='#808080'))
+
+    # Draw north and south wall windows (cyan/blue) from one (n, 4, 2) vertex buffer
+    # The same X ranges are placed once on each wall (north, then south)
+    x0, x1 = np.tile(WINDOWS_X, (2, 1)).T
+    y0 = np.repeat([NORTH_WALL_Y - 0.05, SOUTH_WALL_Y - 0.15], len(WINDOWS_X))
+    y1 = y0 + 0.20
+    window_verts = np.stack([x0, y0, x1, y0, x1, y1, x0, y1], axis=1).reshape(-1, 4, 2)
+    ax.add_collection(PolyCollection(window_verts, linewidths=2, edgecolors='blue',
+                                     facecolors='#87CEEB', alpha=0.8))
 
     # Draw door on east wall (brown)
     door = Rectangle(
@@ -120,32 +132,22 @@ def create_room_scheme():
     )
     ax.add_patch(door)
 
-    # Draw validation sensor grid points
-    sensor_x = []
-    sensor_y = []
-    for ix in range(NX):
-        x = START_X + ix * SPACING
-        for iy in range(NY):
-            y = START_Y + iy * SPACING
-            sensor_x.append(x)
-            sensor_y.append(y)
-
-    ax.scatter(sensor_x, sensor_y, c='red', s=80, marker='o',
+    # Draw validation sensor grid points as one (N, 2) offsets array
+    X, Y = np.meshgrid(START_X + np.arange(NX) * SPACING,
+                       START_Y + np.arange(NY) * SPACING, indexing='ij')
+    offsets = np.column_stack([X.ravel(), Y.ravel()])
+
+    ax.scatter(offsets[:, 0], offsets[:, 1], c='red', s=80, marker='o',
                edgecolors='darkred', linewidths=1.5, zorder=10,
                label=f'Luxmeter positions ({NX}×{NY}={NX*NY})')
 
-    # Draw grid lines connecting sensors
-    for ix in range(NX):
-        x = START_X + ix * SPACING
-        y_start = START_Y
-        y_end = START_Y + (NY - 1) * SPACING
-        ax.plot([x, x], [y_start, y_end], 'r--', alpha=0.3, linewidth=0.8)
-
-    for iy in range(NY):
-        y = START_Y + iy * SPACING
-        x_start = START_X
-        x_end = START_X + (NX - 1) * SPACING
-        ax.plot([x_start, x_end], [y, y], 'r--', alpha=0.3, linewidth=0.8)
+    # Draw grid lines connecting sensors (one collection for all segments)
+    x_end = START_X + (NX - 1) * SPACING
+    y_end = START_Y + (NY - 1) * SPACING
+    vlines = [[(x, START_Y), (x, y_end)] for x in START_X + np.arange(NX) * SPACING]
+    hlines = [[(START_X, y), (x_end, y)] for y in START_Y + np.arange(NY) * SPACING]
+    ax.add_collection(LineCollection(vlines + hlines, colors='red', linestyles='--',
+                                     linewidths=0.8, alpha=0.3))
 
     # Add dimension annotations
     # Room width
@@ -201,7 +203,7 @@ def create_room_scheme():
 
     # Title and info
     ax.set_title('Room Scheme - Validation Sensor Grid\n'
-                 f'Grid: {NX}×{NY} = {NX*NY} points | Spacing: {SPACING} m | Height: 0.75 m',
+                 f'Grid: {NX}×{NY} = {NX*NY} points | Spacing: {SPACING} m | Height: {ROOM.work_plane_z} m',
                  fontsize=14, fontweight='bold', pad=20)
 
     # Legend
@@ -215,19 +217,7 @@ def create_room_scheme():
     ax.legend(handles=legend_elements, loc='upper right', fontsize=10)
 
     # Grid specifications text box
-    specs_text = (
-        f"Validation Grid Specifications:\n"
-        f"  Points X (E→W): {NX}\n"
-        f"  Points Y (N↔S): {NY}\n"
-        f"  Total sensors: {NX*NY}\n"
-        f"  Spacing: {SPACING} m\n"
-        f"  Height: 0.75 m\n"
-        f"\nWall offsets:\n"
-        f"  From East: {OFFSET_EAST} m\n"
-        f"  From South: {OFFSET_SOUTH} m\n"
-        f"  To West: 0.68 m\n"
-        f"  To North: 0.51 m"
-    )
+    specs_text = _specs_text(NX, NY, SPACING, OFFSET_EAST, OFFSET_SOUTH)
     ax.text(0.02, 0.02, specs_text, transform=ax.transAxes,
             fontsize=9, verticalalignment='bottom', family='monospace',
             bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.9, edgecolor='orange'))
@@ -240,16 +230,20 @@ def create_room_scheme():
     ax.set_ylabel('Y coordinate [m]', fontsize=12)
     ax.grid(True, alpha=0.2, linestyle=':')
 
-    plt.tight_layout()
+    # Fixed margins (tuned from tight_layout at the default figsize)
+    fig.subplots_adjust(left=0.055, right=0.99, top=0.975, bottom=0.012)
 
     # Save
-    os.makedirs('images', exist_ok=True)
-    output_path = 'images/room_scheme_validation.png'
-    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"Saved: {output_path}")
+    output_dir = Path('images')
+    output_dir.mkdir(exist_ok=True)
+    output_path = output_dir / 'room_scheme_validation.png'
+    fig.savefig(output_path, dpi=dpi, facecolor='white', metadata={})
+    log.info("Saved: %s", output_path)
 
-    plt.close()
+    if own_fig:
+        plt.close(fig)
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     create_room_scheme()
@@ -11,12 +11,15 @@ Based on physical luxmeter measurement grid specifications:
 - Sensor height: 0.75m
 """
 
+import numpy as np
+
+from geometry import ROOM
+
 # Main room dimensions (from PISO-CONCRETO-PULIDOIER floor polygon)
-# Floor corners: (0.459, -9.653) to (8.319, -0.083)
-room_min_x = 0.458644626504064   # East wall
-room_max_x = 8.31864462650407    # West wall
-room_min_y = -9.65327504952668   # South wall (windows)
-room_max_y = -0.0832750495266698 # North wall (windows)
+room_min_x = ROOM.min_x   # East wall
+room_max_x = ROOM.max_x   # West wall
+room_min_y = ROOM.min_y   # South wall (windows)
+room_max_y = ROOM.max_y   # North wall (windows)
 
 # Validation grid specifications from luxmeter measurements
 nx = 7   # Points in X direction (east to west, front to back)
@@ -34,7 +37,7 @@ start_x = room_min_x + offset_east  # First column (near east wall)
 start_y = room_min_y + offset_south # First row (near south wall)
 
 # Work plane height
-work_plane_z = 0.750
+work_plane_z = ROOM.work_plane_z
 
 # Print grid information
 print("Validation Sensor Grid (Luxmeter Measurement Points)")
@@ -73,20 +76,15 @@ print(f"  Calculated north offset: {actual_north_offset:.3f} m (specified: {offs
 
 # Generate grid points
 # Order: iterate X first, then Y (same as original script)
-grid_points = []
-
-for ix in range(nx):
-    x = start_x + ix * spacing
-    for iy in range(ny):
-        y = start_y + iy * spacing
-        # Format: x y z dx dy dz (direction vector pointing up)
-        grid_points.append(f"{x:.6f} {y:.6f} {work_plane_z:.4f} 0 0 1")
+xs = start_x + np.arange(nx) * spacing
+ys = start_y + np.arange(ny) * spacing
+X, Y = np.meshgrid(xs, ys, indexing='ij')
+grid_points = np.column_stack([X.ravel(), Y.ravel(), np.full(nx * ny, work_plane_z)])
 
 # Write to points_validation.txt
+# Format: x y z dx dy dz (direction vector pointing up)
 output_file = "points_validation.txt"
-with open(output_file, 'w') as f:
-    for point in grid_points:
-        f.write(point + '\n')
+np.savetxt(output_file, grid_points, fmt='%.6f %.6f %.4f 0 0 1')
 
 print(f"\n✓ Generated {len(grid_points)} sensor points")
 print(f"✓ Work plane height: {work_plane_z} m")
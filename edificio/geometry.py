@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Shared main-room geometry for the edificio scripts.
+
+Extents come from the PISO-CONCRETO-PULIDOIER floor polygon and window
+extents from glazing.geom. Import with `from geometry import ROOM`.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class RoomGeometry:
+    """Main room floor extents [m], window X ranges and work plane height"""
+    min_x: float                # East wall
+    max_x: float                # West wall
+    min_y: float                # South wall
+    max_y: float                # North wall
+    windows_x: np.ndarray       # (n, 2) rows of (x_start, x_end), same on north and south walls
+    work_plane_z: float = 0.750
+
+    @property
+    def width(self):
+        """Room width along X (E-W)"""
+        return self.max_x - self.min_x
+
+    @property
+    def depth(self):
+        """Room depth along Y (N-S)"""
+        return self.max_y - self.min_y
+
+
+# Five 1.10 m windows, at the same X ranges on the north and south walls
+WINDOWS_X = np.array([
+    (1.05964463, 2.15764463),
+    (2.15964463, 3.25764463),
+    (3.25964463, 4.35764463),
+    (4.35964463, 5.45764463),
+    (5.45964463, 6.55764463),
+])
+WINDOWS_X.flags.writeable = False
+
+# Floor corners: (0.459, -9.653) to (8.319, -0.083)
+ROOM = RoomGeometry(
+    min_x=0.458644626504064,
+    max_x=8.31864462650407,
+    min_y=-9.65327504952668,
+    max_y=-0.0832750495266698,
+    windows_x=WINDOWS_X,
+)
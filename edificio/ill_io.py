@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Shared annual .ill loading for the edificio scripts and scripts/radiance_io.py.
+
+Parses Radiance annual illuminance matrices and caches them as a float32
+.npy sidecar next to the .ill file, so every reader of a sidecar goes
+through the same parser. Import with `from ill_io import load_annual_ill`.
+"""
+
+import mmap
+import os
+
+import numpy as np
+
+# Header lines start with metadata keywords or special characters
+HEADER_KEYWORDS = ('#', 'NCOMP', 'NROWS', 'NCOLS', 'FORMAT', 'SOFTWARE',
+                   'CAPDATE', 'GMT', 'rmtxop', 'dctimestep', 'Applied',
+                   'Transposed', 'LATLONG')
+_HEADER_KEYWORDS_BYTES = tuple(keyword.encode() for keyword in HEADER_KEYWORDS)
+
+
+def parse_annual_ill_file(filepath, dtype=np.float32):
+    """
+    Parse the annual.ill file
+    Returns: numpy array of shape (timesteps, sensors)
+    """
+    # A 0-byte file cannot be memory-mapped
+    if os.path.getsize(filepath) == 0:
+        return np.empty((0, 0), dtype=dtype)
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Only the header is scanned in Python, as raw bytes of the mapping
+        start = 0
+        while start < len(mm):
+            end = mm.find(b'\n', start)
+            if end == -1:
+                end = len(mm)
+            line = mm[start:end]
+            if line.strip() and not line.startswith(_HEADER_KEYWORDS_BYTES):  # Found first data line
+                break
+            start = end + 1
+        else:
+            return np.empty((0, 0), dtype=dtype)
+
+        # The data block is tokenized in C by NumPy (any whitespace separates values);
+        # float32 is plenty for lux values and halves the memory footprint
+        ncols = len(line.split())
+        return np.fromstring(mm[start:], dtype=dtype, sep=' ').reshape(-1, ncols)
+
+
+def load_sidecar(filepath):
+    """
+    Memory-map the .npy sidecar of an .ill file.
+    Returns None when the sidecar is missing, older than the .ill file or unreadable.
+    """
+    npy_path = filepath + '.npy'
+    if not os.path.exists(npy_path) or os.path.getmtime(npy_path) < os.path.getmtime(filepath):
+        return None
+    try:
+        return np.load(npy_path, mmap_mode='r')
+    except (OSError, ValueError):  # e.g. truncated by an interrupted run
+        return None
+
+
+def save_sidecar(filepath, data):
+    """
+    Write the float32 .npy sidecar of an .ill file.
+    The array goes to a temporary file that is then renamed into place, so an
+    interrupted run never leaves a partial sidecar; an unwritable directory
+    just skips the cache.
+    """
+    npy_path = filepath + '.npy'
+    tmp_path = f"{npy_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.save(f, data.astype(np.float32, copy=False))
+        os.replace(tmp_path, npy_path)
+    except OSError:
+        # Read-only results directory or full disk: work without the cache
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_annual_ill(filepath):
+    """
+    Load an annual .ill file through a float32 .npy sidecar cache.
+    The sidecar is memory-mapped on reload and rebuilt whenever the
+    .ill file is newer or the sidecar cannot be read.
+    """
+    data = load_sidecar(filepath)
+    if data is not None:
+        return data
+
+    data = parse_annual_ill_file(filepath)
+    save_sidecar(filepath, data)
+    return data
@@ -3,8 +3,11 @@
 Visualize the building geometry to understand the layout.
 """
 
+import matplotlib
+matplotlib.use('Agg')  # file output only; skip GUI backend setup
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.collections import PatchCollection
 import numpy as np
 
 # Main room floor boundaries
@@ -26,60 +29,83 @@ south_windows = [
     (1.060, 6.558),  # X range
 ]
 
-# Create figure
-fig, ax = plt.subplots(1, 1, figsize=(14, 10))
-
-# Draw corridor
-corridor = patches.Rectangle(
-    (corr_x_min, corr_y_min),
-    corr_x_max - corr_x_min,
-    corr_y_max - corr_y_min,
-    linewidth=2,
-    edgecolor='blue',
-    facecolor='lightblue',
-    alpha=0.3,
-    label='Corridor (PISO-PASILLOIER)'
-)
-ax.add_patch(corridor)
-
-# Draw main room
-main_room = patches.Rectangle(
-    (main_x_min, main_y_min),
-    main_x_max - main_x_min,
-    main_y_max - main_y_min,
-    linewidth=2,
-    edgecolor='red',
-    facecolor='lightyellow',
-    alpha=0.5,
-    label='Main Room (PISO-CONCRETO-PULIDOIER)'
-)
-ax.add_patch(main_room)
-
-# Draw windows on north wall (y ≈ 0.117)
-for x_start, x_end in north_windows:
-    window = patches.Rectangle(
-        (x_start, 0.117 - 0.05),
-        x_end - x_start,
-        0.1,
-        linewidth=1,
-        edgecolor='cyan',
-        facecolor='lightcyan',
-        alpha=0.7
+# Plot extents; the figure is sized from them so no tight-bbox pass is needed
+x_limits = (-3.5, 12.5)
+y_limits = (-14.5, 1.5)
+inches_per_meter = 0.55
+
+
+def draw_static(ax):
+    """Draw the fixed background: corridor, main room and windows"""
+    # Draw corridor
+    corridor = patches.Rectangle(
+        (corr_x_min, corr_y_min),
+        corr_x_max - corr_x_min,
+        corr_y_max - corr_y_min,
+        linewidth=2,
+        edgecolor='blue',
+        facecolor='lightblue',
+        alpha=0.3,
+        label='Corridor (PISO-PASILLOIER)'
+    )
+    ax.add_patch(corridor)
+
+    # Draw main room
+    main_room = patches.Rectangle(
+        (main_x_min, main_y_min),
+        main_x_max - main_x_min,
+        main_y_max - main_y_min,
+        linewidth=2,
+        edgecolor='red',
+        facecolor='lightyellow',
+        alpha=0.5,
+        label='Main Room (PISO-CONCRETO-PULIDOIER)'
     )
-    ax.add_patch(window)
-
-# Draw windows on south wall (y ≈ -9.853)
-for x_start, x_end in south_windows:
-    window = patches.Rectangle(
-        (x_start, -9.853 - 0.05),
-        x_end - x_start,
-        0.1,
+    ax.add_patch(main_room)
+
+    # Draw windows on north (y ≈ 0.117) and south (y ≈ -9.853) walls as one collection
+    windows = (
+        [patches.Rectangle((x_start, 0.117 - 0.05), x_end - x_start, 0.1)
+         for x_start, x_end in north_windows] +
+        [patches.Rectangle((x_start, -9.853 - 0.05), x_end - x_start, 0.1)
+         for x_start, x_end in south_windows]
+    )
+    ax.add_collection(PatchCollection(
+        windows,
         linewidth=1,
         edgecolor='cyan',
         facecolor='lightcyan',
         alpha=0.7
+    ))
+
+    return ax
+
+
+def draw_sensors(ax, grid):
+    """
+    Draw the sensor grid outline; grid is (x_min, x_max, y_min, y_max).
+    Returns the artist so an interactive caller can update only it.
+
+    Blitting recipe for interactive use: draw the static layer once,
+    cache it with bg = fig.canvas.copy_from_bbox(ax.bbox), then on each
+    update call fig.canvas.restore_region(bg), ax.draw_artist(artist)
+    and fig.canvas.blit(ax.bbox). Create the artist with animated=True
+    so full redraws skip it.
+    """
+    x_min, x_max, y_min, y_max = grid
+    sensor_grid = patches.Rectangle(
+        (x_min, y_min),
+        x_max - x_min,
+        y_max - y_min,
+        linewidth=2,
+        edgecolor='green',
+        facecolor='none',
+        linestyle='--',
+        label='Recommended Sensor Grid (0.5m offset)'
     )
-    ax.add_patch(window)
+    ax.add_patch(sensor_grid)
+    return sensor_grid
+
 
 # Recommended sensor grid (main room with 0.5m offset)
 offset = 0.5
@@ -88,49 +114,44 @@ grid_x_max = main_x_max - offset
 grid_y_min = main_y_min + offset
 grid_y_max = main_y_max - offset
 
-sensor_grid = patches.Rectangle(
-    (grid_x_min, grid_y_min),
-    grid_x_max - grid_x_min,
-    grid_y_max - grid_y_min,
-    linewidth=2,
-    edgecolor='green',
-    facecolor='none',
-    linestyle='--',
-    label='Recommended Sensor Grid (0.5m offset)'
-)
-ax.add_patch(sensor_grid)
-
-# Add dimensions
-ax.text((main_x_min + main_x_max) / 2, main_y_min - 0.5,
-        f'{main_x_max - main_x_min:.2f}m', ha='center', fontsize=10, weight='bold')
-ax.text(main_x_min - 0.5, (main_y_min + main_y_max) / 2,
-        f'{main_y_max - main_y_min:.2f}m', ha='right', va='center', fontsize=10, weight='bold', rotation=90)
-
-ax.text((corr_x_min + corr_x_max) / 2, corr_y_min - 0.5,
-        f'{corr_x_max - corr_x_min:.2f}m', ha='center', fontsize=10, color='blue')
-ax.text(corr_x_min - 0.5, (corr_y_min + corr_y_max) / 2,
-        f'{corr_y_max - corr_y_min:.2f}m', ha='right', va='center', fontsize=10, color='blue', rotation=90)
-
-# Labels
-ax.text((main_x_min + main_x_max) / 2, (main_y_min + main_y_max) / 2,
-        'MAIN ROOM\n8.26m × 9.97m\n82.4 m²',
-        ha='center', va='center', fontsize=12, weight='bold', color='darkred')
-
-ax.text((corr_x_min + corr_x_max) / 2, (corr_y_min + corr_y_max) / 2,
-        'CORRIDOR\n14.26m × 3.65m',
-        ha='center', va='center', fontsize=10, color='darkblue')
-
-ax.text((grid_x_min + grid_x_max) / 2, grid_y_max + 0.3,
-        'Sensor Grid: 7.26m × 8.97m\n~238 sensors @ 0.5m spacing',
-        ha='center', va='bottom', fontsize=9, color='green', weight='bold')
-
-# Add window labels
-ax.text(3.8, 0.5, 'North Windows', ha='center', fontsize=9, color='cyan', style='italic')
-ax.text(3.8, -10.2, 'South Windows', ha='center', fontsize=9, color='cyan', style='italic')
+# Create figure
+fig, ax = plt.subplots(1, 1, figsize=(
+    (x_limits[1] - x_limits[0]) * inches_per_meter + 1.2,
+    (y_limits[1] - y_limits[0]) * inches_per_meter + 1.4,
+))
+
+draw_static(ax)
+draw_sensors(ax, (grid_x_min, grid_x_max, grid_y_min, grid_y_max))
+
+# Static labels: (text, x, y, text kwargs), drawn in one pass
+LABELS = [
+    # Dimensions
+    (f'{main_x_max - main_x_min:.2f}m', (main_x_min + main_x_max) / 2, main_y_min - 0.5,
+     dict(ha='center', fontsize=10, weight='bold')),
+    (f'{main_y_max - main_y_min:.2f}m', main_x_min - 0.5, (main_y_min + main_y_max) / 2,
+     dict(ha='right', va='center', fontsize=10, weight='bold', rotation=90)),
+    (f'{corr_x_max - corr_x_min:.2f}m', (corr_x_min + corr_x_max) / 2, corr_y_min - 0.5,
+     dict(ha='center', fontsize=10, color='blue')),
+    (f'{corr_y_max - corr_y_min:.2f}m', corr_x_min - 0.5, (corr_y_min + corr_y_max) / 2,
+     dict(ha='right', va='center', fontsize=10, color='blue', rotation=90)),
+    # Space labels
+    ('MAIN ROOM\n8.26m × 9.97m\n82.4 m²', (main_x_min + main_x_max) / 2, (main_y_min + main_y_max) / 2,
+     dict(ha='center', va='center', fontsize=12, weight='bold', color='darkred')),
+    ('CORRIDOR\n14.26m × 3.65m', (corr_x_min + corr_x_max) / 2, (corr_y_min + corr_y_max) / 2,
+     dict(ha='center', va='center', fontsize=10, color='darkblue')),
+    ('Sensor Grid: 7.26m × 8.97m\n~238 sensors @ 0.5m spacing', (grid_x_min + grid_x_max) / 2, grid_y_max + 0.3,
+     dict(ha='center', va='bottom', fontsize=9, color='green', weight='bold')),
+    # Window labels
+    ('North Windows', 3.8, 0.5, dict(ha='center', fontsize=9, color='cyan', style='italic')),
+    ('South Windows', 3.8, -10.2, dict(ha='center', fontsize=9, color='cyan', style='italic')),
+]
+
+for text, x, y, kw in LABELS:
+    ax.text(x, y, text, **kw)
 
 # Set axis properties
-ax.set_xlim(-3.5, 12.5)
-ax.set_ylim(-14.5, 1.5)
+ax.set_xlim(*x_limits)
+ax.set_ylim(*y_limits)
 ax.set_aspect('equal')
 ax.grid(True, alpha=0.3)
 ax.set_xlabel('X (meters)', fontsize=11)
@@ -142,8 +163,9 @@ ax.legend(loc='upper right', fontsize=9)
 ax.plot(0, 0, 'ko', markersize=8, label='Origin (0,0)')
 ax.text(0.2, 0.2, '(0,0)', fontsize=8)
 
-plt.tight_layout()
-plt.savefig('/Users/gbv/radiance_claude/edificio/floor_layout.png', dpi=150, bbox_inches='tight')
+# Fixed margins (tuned from tight_layout output for this figure size)
+fig.subplots_adjust(left=0.076, right=0.985, top=0.943, bottom=0.053)
+plt.savefig('/Users/gbv/radiance_claude/edificio/floor_layout.png', dpi=150, pad_inches=0)
 print("Floor layout visualization saved to: /Users/gbv/radiance_claude/edificio/floor_layout.png")
 
 # Print summary
@@ -8,11 +8,13 @@ Based on physical luxmeter measurement grid (7×9 = 63 sensors).
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
-from datetime import datetime
+from datetime import date, datetime
 import argparse
 import sys
 import os
 
+from ill_io import load_annual_ill
+
 # Validation grid parameters (from generate_sensor_grid_validation.py)
 # Room dimensions
 ROOM_MIN_X = 0.458644626504064   # East wall
@@ -35,100 +37,104 @@ START_Y = ROOM_MIN_Y + OFFSET_SOUTH
 TOTAL_SENSORS = NX * NY  # 63
 
 
-def parse_annual_ill_file(filepath):
-    """
-    Parse the annual.ill file
-    Returns: numpy array of shape (timesteps, sensors)
-    """
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-
-    # Skip header lines
-    skip_keywords = ['#', 'NCOMP', 'NROWS', 'NCOLS', 'FORMAT', 'SOFTWARE',
-                     'CAPDATE', 'GMT', 'rmtxop', 'dctimestep', 'Applied',
-                     'Transposed', 'LATLONG']
-
-    data_start = 0
-    for i, line in enumerate(lines):
-        is_header = False
-        for keyword in skip_keywords:
-            if line.startswith(keyword):
-                is_header = True
-                break
-        if not is_header and line.strip():
-            data_start = i
-            break
-
-    # Read illuminance data
-    data = []
-    for line in lines[data_start:]:
-        if line.strip():
-            try:
-                values = [float(x) for x in line.split()]
-                if len(values) > 0:
-                    data.append(values)
-            except ValueError:
-                continue
-
-    return np.array(data)
-
-
 def datetime_to_hour_of_year(dt, year=2024):
     """
     Convert datetime to hour of year index (0-8759).
     Uses interval ending at requested time.
     """
-    start_of_year = datetime(year, 1, 1, 0, 0, 0)
-    target_dt = datetime(year, dt.month, dt.day, dt.hour, 0, 0)
-    delta = target_dt - start_of_year
-    hour_of_year = int(delta.total_seconds() / 3600)
-    return max(0, hour_of_year - 1)
+    days = date(year, dt.month, dt.day).toordinal() - date(year, 1, 1).toordinal()
+    return max(0, days * 24 + dt.hour - 1)
 
 
 def create_grid_coordinates():
-    """Create X, Y coordinates for validation sensor positions"""
-    x_coords = []
-    y_coords = []
+    """Create X, Y coordinates for validation sensor positions (X-major, iy varies fastest)"""
+    X, Y = np.meshgrid(START_X + np.arange(NX) * SPACING,
+                       START_Y + np.arange(NY) * SPACING, indexing='ij')
+    return X.ravel().astype(np.float32), Y.ravel().astype(np.float32)
 
-    for ix in range(NX):
-        x = START_X + ix * SPACING
-        for iy in range(NY):
-            y = START_Y + iy * SPACING
-            x_coords.append(x)
-            y_coords.append(y)
 
-    return np.array(x_coords), np.array(y_coords)
-
-
-def reshape_to_grid(illuminance_values, x_coords, y_coords):
+def grid_indices(x_coords, y_coords):
     """
-    Reshape 1D illuminance values into 2D grid
-    Returns: 2D array, x_unique, y_unique
+    Map sensors onto the 2D grid
+    Returns: x_unique, y_unique, ix, iy (grid[iy, ix] holds sensor i)
     """
     x_unique = np.unique(x_coords)
     y_unique = np.unique(y_coords)
 
-    nx = len(x_unique)
-    ny = len(y_unique)
+    # Coordinates sit exactly on the lattice, so searchsorted gives each sensor's cell
+    ix = np.searchsorted(x_unique, x_coords)
+    iy = np.searchsorted(y_unique, y_coords)
+
+    return x_unique, y_unique, ix, iy
 
-    grid = np.full((ny, nx), np.nan)
 
-    for i, (x, y, val) in enumerate(zip(x_coords, y_coords, illuminance_values)):
-        ix = np.argmin(np.abs(x_unique - x))
-        iy = np.argmin(np.abs(y_unique - y))
-        grid[iy, ix] = val
+def build_grids(ill, ix, iy, ny, nx):
+    """
+    Scatter a (T, N) block of hourly readings onto T (ny, nx) grids in one pass
+    Returns: grids (T, ny, nx), per-hour mean (T,) and max (T,) ignoring NaN
+    """
+    T = ill.shape[0]
+    grids = np.full((T, ny, nx), np.nan, dtype=ill.dtype)
+    grids[:, iy, ix] = ill
 
-    return grid, x_unique, y_unique
+    finite = np.isfinite(ill)
+    count = finite.sum(axis=1)
+    gmean = np.divide(np.where(finite, ill, 0).sum(axis=1), count,
+                      out=np.full(T, np.nan), where=count > 0)
+    gmax = np.where(finite, ill, -np.inf).max(axis=1, initial=-np.inf)
+    gmax[count == 0] = np.nan
 
+    return grids, gmean, gmax
 
-def create_hourly_grid_figure(illuminance_data, x_coords, y_coords, date_str, output_file=None):
+
+def render_panel(ax, Xr, Yr, grid, x_rot, y_rot, title, mean, vmax, cmap, norm, levels, label_levels):
+    """
+    Draw one hour's contour panel with its sensors and statistics box
+    Returns: the filled contour set (for the shared colorbar), None for a dark panel
+    """
+    if not vmax >= 1.0:
+        # Sun below the horizon (or no data): a flat field has nothing to contour
+        cf = None
+        ax.set_facecolor('lightgray')
+        ax.set_xlim(Xr.min(), Xr.max())
+        ax.set_ylim(Yr.min(), Yr.max())
+        ax.text(0.5, 0.5, 'No daylight', transform=ax.transAxes,
+                ha='center', va='center', fontsize=12, color='dimgray', zorder=6,
+                bbox=dict(boxstyle='round', facecolor='white', alpha=0.8, edgecolor='gray'))
+    else:
+        # Filled contours
+        cf = ax.contourf(Xr, Yr, grid, cmap=cmap, norm=norm, alpha=0.7, levels=levels, extend='max')
+
+        # Contour lines; only a few levels are labelled, and only when crossed
+        cs = ax.contour(Xr, Yr, grid, colors='black', levels=levels, linewidths=0.5)
+        if vmax > label_levels[0]:
+            ax.clabel(cs, levels=label_levels, inline=True, fontsize=7, fmt='%g')
+
+    # Plot sensor points
+    ax.plot(x_rot, y_rot, 'o', mfc='white', mec='black', mew=0.5, ms=4.5, ls='', zorder=5)
+
+    # Set title and labels
+    ax.set_title(title, fontsize=12, fontweight='bold')
+    ax.set_aspect('equal', adjustable='box')
+    ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.3)
+
+    # Statistics
+    stats_text = f'Mean: {mean:.0f} lx\nMax: {vmax:.0f} lx'
+    ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
+            fontsize=8, verticalalignment='top',
+            bbox=dict(boxstyle='round', facecolor='white', alpha=0.8, edgecolor='gray'))
+
+    return cf
+
+
+def create_hourly_grid_figure(illuminance_data, x_coords, y_coords, date_str, output_file=None, dpi=150):
     """
     Create a multi-panel figure showing illuminance for hours 9-17.
     Layout: 3 rows × 3 columns for hours 9, 10, 11, 12, 13, 14, 15, 16, 17
     """
     hours = list(range(9, 18))  # 9 to 17 inclusive
 
-    fig, axes = plt.subplots(3, 3, figsize=(18, 16))
+    fig, axes = plt.subplots(3, 3, figsize=(18, 16), layout='constrained')
     axes = axes.flatten()
 
     # Parse date
@@ -141,84 +147,70 @@ def create_hourly_grid_figure(illuminance_data, x_coords, y_coords, date_str, ou
     # Create custom colormap with better visibility
     cmap = plt.cm.jet
 
-    # Track global min/max for consistent colorbar
-    global_max = 0
+    # One norm shared by every panel and the colorbar
+    levels_arr = np.asarray(niveles)
+    norm = mcolors.BoundaryNorm(levels_arr, cmap.N)
 
-    for idx, hour in enumerate(hours):
-        ax = axes[idx]
+    # Subset of levels that get inline labels on the small panels
+    label_levels = [500, 1000, 2000, 5000]
+
+    # Sensor subset and grid geometry are the same for every hour
+    min_count = min(len(x_coords), illuminance_data.shape[1])
+    x_coords = x_coords[:min_count]
+    y_coords = y_coords[:min_count]
+    x_unique, y_unique, ix, iy = grid_indices(x_coords, y_coords)
 
-        # Get datetime and hour of year
+    # Rows for every panel hour (zeros past the end of the data), gridded at once
+    ill = np.zeros((len(hours), min_count), dtype=illuminance_data.dtype)
+    for idx, hour in enumerate(hours):
         dt = datetime(date_obj.year, date_obj.month, date_obj.day, hour, 0, 0)
         hour_of_year = datetime_to_hour_of_year(dt)
-
-        # Get illuminance values
         if hour_of_year < illuminance_data.shape[0]:
-            illuminance_values = illuminance_data[hour_of_year, :]
-        else:
-            illuminance_values = np.zeros(len(x_coords))
+            ill[idx] = illuminance_data[hour_of_year, :min_count]
+    grids, gmean, gmax = build_grids(ill, ix, iy, len(y_unique), len(x_unique))
 
-        # Trim if needed
-        min_count = min(len(x_coords), len(illuminance_values))
-        illum = illuminance_values[:min_count]
+    # Create meshgrid
+    XX, YY = np.meshgrid(x_unique, y_unique)
 
-        global_max = max(global_max, np.nanmax(illum))
+    # Rotate 90° counter-clockwise: (x', y') = (-y, x) to have north face left
+    Xr = -YY
+    Yr = XX
 
-        # Reshape to 2D grid
-        grid, x_unique, y_unique = reshape_to_grid(illum, x_coords[:min_count], y_coords[:min_count])
+    # Sensor points in the rotated frame
+    x_rot = -y_coords
+    y_rot = x_coords
 
-        # Create meshgrid
-        XX, YY = np.meshgrid(x_unique, y_unique)
-
-        # Rotate 90° counter-clockwise: (x', y') = (-y, x) to have north face left
-        Xr = -YY
-        Yr = XX
-
-        # Filled contours
-        cf = ax.contourf(Xr, Yr, grid, cmap=cmap, alpha=0.7, levels=niveles, extend='max')
-
-        # Contour lines
-        cs = ax.contour(Xr, Yr, grid, colors='black', levels=niveles, linewidths=0.5)
-        ax.clabel(cs, inline=True, fontsize=7, fmt='%g')
-
-        # Plot sensor points
-        x_rot = -y_coords[:min_count]
-        y_rot = x_coords[:min_count]
-        ax.scatter(x_rot, y_rot, c='white', s=20, edgecolors='black', linewidths=0.5, zorder=5)
-
-        # Set title and labels
-        ax.set_title(f'{hour:02d}:00', fontsize=12, fontweight='bold')
-        ax.set_aspect('equal', adjustable='box')
-        ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.3)
-
-        # Statistics
-        stats_text = f'Mean: {np.nanmean(illum):.0f} lx\nMax: {np.nanmax(illum):.0f} lx'
-        ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
-                fontsize=8, verticalalignment='top',
-                bbox=dict(boxstyle='round', facecolor='white', alpha=0.8, edgecolor='gray'))
-
-    # Add colorbar
-    fig.subplots_adjust(right=0.9)
-    cbar_ax = fig.add_axes([0.92, 0.15, 0.02, 0.7])
-    sm = plt.cm.ScalarMappable(cmap=cmap, norm=mcolors.BoundaryNorm(niveles, cmap.N))
-    sm.set_array([])
-    cbar = fig.colorbar(sm, cax=cbar_ax, label='Illuminance [lux]', extend='max')
+    cf = None
+    for idx, hour in enumerate(hours):
+        ax = axes[idx]
+        panel_cf = render_panel(ax, Xr, Yr, grids[idx], x_rot, y_rot, f'{hour:02d}:00',
+                                gmean[idx], gmax[idx], cmap, norm, levels_arr, label_levels)
+        if panel_cf is not None:
+            cf = panel_cf
+
+    # Add colorbar (from the norm alone when every panel is dark)
+    if cf is None:
+        cf = plt.cm.ScalarMappable(norm=norm, cmap=cmap)
+        cbar = fig.colorbar(cf, ax=axes.tolist(), shrink=0.85, label='Illuminance [lux]',
+                            extend='max', alpha=0.7)
+    else:
+        cbar = fig.colorbar(cf, ax=axes.tolist(), shrink=0.85, label='Illuminance [lux]')
     cbar.set_ticks(niveles)
 
     # Main title
     fig.suptitle(f'Validation Grid Hourly Illuminance - {date_str}\n'
                  f'Sensor Grid: {NX}×{NY} = {NX*NY} points, Spacing: {SPACING}m, Height: {WORK_PLANE_Z}m',
-                 fontsize=14, fontweight='bold', y=0.98)
+                 fontsize=14, fontweight='bold')
 
     # Add orientation note
-    fig.text(0.5, 0.01, 'Orientation: North ← (left) | Windows on North and South walls',
-             ha='center', fontsize=10, style='italic')
-
-    plt.tight_layout(rect=[0, 0.02, 0.9, 0.95])
+    fig.supxlabel('Orientation: North ← (left) | Windows on North and South walls',
+                  fontsize=10, style='italic')
 
     if output_file:
         os.makedirs('images', exist_ok=True)
         output_path = os.path.join('images', output_file)
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        # Constrained layout already fills the figure, so no bbox_inches='tight' re-render
+        plt.savefig(output_path, dpi=dpi, pil_kwargs={'optimize': False, 'compress_level': 1})
         print(f"Saved: {output_path}")
     else:
         plt.show()
@@ -234,6 +226,8 @@ def main():
                        help='Output file name (saved to images/ folder)')
     parser.add_argument('--data-file', type=str, default='results/dc/annual_validation.ill',
                        help='Path to annual_validation.ill file')
+    parser.add_argument('--dpi', type=int, default=150,
+                       help='Output resolution (default: 150, use 300 for print)')
 
     args = parser.parse_args()
 
@@ -247,7 +241,7 @@ def main():
     # Load annual illuminance data
     print(f"Loading data from: {args.data_file}")
     try:
-        illuminance_data = parse_annual_ill_file(args.data_file)
+        illuminance_data = load_annual_ill(args.data_file)
         print(f"Data shape: {illuminance_data.shape} (timesteps × sensors)")
     except Exception as e:
         print(f"Error loading data: {e}")
@@ -263,7 +257,7 @@ def main():
 
     # Create visualization
     print(f"Generating hourly grid visualization for {args.date}...")
-    create_hourly_grid_figure(illuminance_data, x_coords, y_coords, args.date, args.output)
+    create_hourly_grid_figure(illuminance_data, x_coords, y_coords, args.date, args.output, args.dpi)
 
     print("Done!")
 
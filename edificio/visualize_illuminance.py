@@ -7,11 +7,14 @@ Generates illuminance maps for specific dates and times
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as colors
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import argparse
+import itertools
 import sys
 import os
 
+from ill_io import HEADER_KEYWORDS, load_sidecar
+
 # Room and sensor grid parameters (main room only)
 # Main room with 0.1m wall offset
 MIN_X = 0.558644626504064
@@ -26,43 +29,26 @@ nx = 20  # X direction
 ny = 24  # Y direction
 total_sensors = 480  # Main room only, 10cm wall offset
 
-def parse_annual_ill_file(filepath):
+def read_ill_row(filepath, row_idx):
     """
-    Parse the annual.ill file
-    Returns: numpy array of shape (timesteps, sensors)
+    Read a single timestep (row) of an annual .ill file without loading the rest.
+    Uses the .npy sidecar when it is up to date, otherwise streams the text file.
+    Returns: float32 array of shape (sensors,); raises IndexError past the last row
     """
+    data = load_sidecar(filepath)
+    if data is not None:
+        if row_idx >= data.shape[0]:
+            raise IndexError(f"exceeds available data ({data.shape[0]} timesteps)")
+        return np.array(data[row_idx])
+
     with open(filepath, 'r') as f:
-        lines = f.readlines()
-
-    # Skip header lines - look for lines that start with metadata keywords or special characters
-    skip_keywords = ['#', 'NCOMP', 'NROWS', 'NCOLS', 'FORMAT', 'SOFTWARE',
-                     'CAPDATE', 'GMT', 'rmtxop', 'dctimestep', 'Applied',
-                     'Transposed', 'LATLONG']
-
-    data_start = 0
-    for i, line in enumerate(lines):
-        is_header = False
-        for keyword in skip_keywords:
-            if line.startswith(keyword):
-                is_header = True
-                break
-        if not is_header and line.strip():  # Found first data line
-            data_start = i
-            break
-
-    # Read illuminance data
-    data = []
-    for line in lines[data_start:]:
-        if line.strip():
-            try:
-                values = [float(x) for x in line.split()]
-                if len(values) > 0:  # Only add non-empty lines
-                    data.append(values)
-            except ValueError:
-                # Skip lines that can't be converted to floats
-                continue
-
-    return np.array(data)
+        rows = (line for line in f
+                if line.strip() and not line.startswith(HEADER_KEYWORDS))
+        line = next(itertools.islice(rows, row_idx, None), None)
+
+    if line is None:
+        raise IndexError(f"exceeds available data in {filepath}")
+    return np.fromstring(line, sep=' ', dtype=np.float32)
 
 def datetime_to_hour_of_year(dt, year=2024):
     """
@@ -76,34 +62,17 @@ def datetime_to_hour_of_year(dt, year=2024):
 
     Example: For 12:00, we want row 11 (interval 11:00-12:00, centered at 11:30)
     """
-    start_of_year = datetime(year, 1, 1, 0, 0, 0)
-    target_dt = datetime(year, dt.month, dt.day, dt.hour, 0, 0)
-    delta = target_dt - start_of_year
-    hour_of_year = int(delta.total_seconds() / 3600)
+    days = date(year, dt.month, dt.day).toordinal() - date(year, 1, 1).toordinal()
     # Subtract 1 to get the interval ENDING at the requested time
-    return max(0, hour_of_year - 1)
+    return max(0, days * 24 + dt.hour - 1)
 
 def create_grid_coordinates():
     """Create X, Y meshgrid for sensor positions matching the actual grid generation"""
     # Match the actual grid generation from generate_sensor_grid.py
-    width = MAX_X - MIN_X
-    depth = MAX_Y - MIN_Y
-
-    # Actual spacing used (from grid generation)
-    spacing_x = width / (nx - 1)
-    spacing_y = depth / (ny - 1)
-
-    x_coords = []
-    y_coords = []
-
-    for ix in range(nx):
-        x = MIN_X + ix * spacing_x
-        for iy in range(ny):
-            y = MIN_Y + iy * spacing_y
-            x_coords.append(x)
-            y_coords.append(y)
-
-    return np.array(x_coords), np.array(y_coords)
+    # (X-major order, iy varies fastest)
+    X, Y = np.meshgrid(np.linspace(MIN_X, MAX_X, nx),
+                       np.linspace(MIN_Y, MAX_Y, ny), indexing='ij')
+    return X.ravel().astype(np.float32), Y.ravel().astype(np.float32)
 
 def reshape_to_grid(illuminance_values, x_coords, y_coords):
     """
@@ -114,21 +83,17 @@ def reshape_to_grid(illuminance_values, x_coords, y_coords):
     x_unique = np.unique(x_coords)
     y_unique = np.unique(y_coords)
 
-    nx = len(x_unique)
-    ny = len(y_unique)
-
-    # Create 2D grid
-    grid = np.full((ny, nx), np.nan)
+    # Coordinates sit exactly on the lattice, so searchsorted gives each sensor's cell
+    ix = np.searchsorted(x_unique, x_coords)
+    iy = np.searchsorted(y_unique, y_coords)
 
-    # Fill grid with illuminance values
-    for i, (x, y, val) in enumerate(zip(x_coords, y_coords, illuminance_values)):
-        ix = np.argmin(np.abs(x_unique - x))
-        iy = np.argmin(np.abs(y_unique - y))
-        grid[iy, ix] = val
+    # Create 2D grid and fill it in one scatter
+    grid = np.full((len(y_unique), len(x_unique)), np.nan)
+    grid[iy, ix] = illuminance_values
 
     return grid, x_unique, y_unique
 
-def visualize_illuminance(illuminance_values, x_coords, y_coords, date_str, time_str, output_file=None):
+def visualize_illuminance(illuminance_values, x_coords, y_coords, date_str, time_str, output_file=None, dpi=150):
     """
     Create illuminance contour visualization with north facing left
     """
@@ -174,12 +139,12 @@ def visualize_illuminance(illuminance_values, x_coords, y_coords, date_str, time
     ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
 
     # Add statistics text box
-    valid_values = illuminance_values[~np.isnan(illuminance_values)]
-    if len(valid_values) > 0:
-        stats_text = f'Min: {np.nanmin(illuminance_values):.1f} lx\n'
-        stats_text += f'Max: {np.nanmax(illuminance_values):.1f} lx\n'
-        stats_text += f'Mean: {np.nanmean(illuminance_values):.1f} lx\n'
-        stats_text += f'Median: {np.nanmedian(illuminance_values):.1f} lx'
+    valid_values = illuminance_values[np.isfinite(illuminance_values)]
+    if valid_values.size:
+        stats_text = f'Min: {valid_values.min():.1f} lx\n'
+        stats_text += f'Max: {valid_values.max():.1f} lx\n'
+        stats_text += f'Mean: {valid_values.mean():.1f} lx\n'
+        stats_text += f'Median: {np.median(valid_values):.1f} lx'
     else:
         stats_text = 'No illuminance data\n(nighttime or no sun)'
 
@@ -200,7 +165,8 @@ def visualize_illuminance(illuminance_values, x_coords, y_coords, date_str, time
     plt.tight_layout()
 
     if output_file:
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        # tight_layout already fits the figure, so no bbox_inches='tight' re-render
+        plt.savefig(output_file, dpi=dpi, pil_kwargs={'optimize': False, 'compress_level': 1})
         print(f"Visualization saved to: {output_file}")
     else:
         plt.show()
@@ -217,6 +183,8 @@ def main():
                        help='Output file name (saved to images/ folder, optional)')
     parser.add_argument('--data-file', type=str, default='results/dc/annual.ill',
                        help='Path to annual.ill file (default: results/dc/annual.ill)')
+    parser.add_argument('--dpi', type=int, default=150,
+                       help='Output resolution (default: 150, use 300 for print)')
 
     args = parser.parse_args()
 
@@ -234,22 +202,18 @@ def main():
     print(f"Requested: {args.date} at {args.time}")
     print(f"Hour of year: {hour_of_year} (0-8759)")
 
-    # Load annual illuminance data
+    # Read only the requested timestep
     print(f"Loading data from: {args.data_file}")
     try:
-        illuminance_data = parse_annual_ill_file(args.data_file)
-        print(f"Data shape: {illuminance_data.shape} (timesteps × sensors)")
+        illuminance_values = read_ill_row(args.data_file, hour_of_year)
+        print(f"Sensors: {illuminance_values.shape[0]}")
+    except IndexError as e:
+        print(f"Error: Hour {hour_of_year} {e}")
+        sys.exit(1)
     except Exception as e:
         print(f"Error loading data: {e}")
         sys.exit(1)
 
-    # Check if hour_of_year is valid
-    if hour_of_year >= illuminance_data.shape[0]:
-        print(f"Error: Hour {hour_of_year} exceeds available data ({illuminance_data.shape[0]} timesteps)")
-        sys.exit(1)
-
-    # Get illuminance values for the requested time
-    illuminance_values = illuminance_data[hour_of_year, :]
     print(f"Illuminance range: {illuminance_values.min():.2f} - {illuminance_values.max():.2f} lux")
 
     # Create grid coordinates
@@ -271,7 +235,7 @@ def main():
         os.makedirs('images', exist_ok=True)
         output_file = os.path.join('images', args.output)
     visualize_illuminance(illuminance_values, x_coords, y_coords,
-                         args.date, args.time, output_file)
+                         args.date, args.time, output_file, args.dpi)
 
     print("Done!")
 
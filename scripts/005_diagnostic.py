@@ -5,7 +5,7 @@ Diagnostic script to verify data alignment between experimental and radiance dat
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from datetime import datetime
+from radiance_io import load_annual_ill, datetime_to_hour_of_year
 
 # %%
 # =============================================================================
@@ -32,38 +32,7 @@ print(f"Points 55-63 (last line): X={points[54:63, 0].mean():.2f}, Y range: {poi
 
 # %%
 # Load radiance illuminance data for 12h
-def parse_annual_ill_file(filepath):
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-
-    skip_keywords = ['#', 'NCOMP', 'NROWS', 'NCOLS', 'FORMAT', 'SOFTWARE',
-                     'CAPDATE', 'GMT', 'rmtxop', 'dctimestep', 'Applied',
-                     'Transposed', 'LATLONG']
-
-    data_start = 0
-    for i, line in enumerate(lines):
-        is_header = any(line.startswith(kw) for kw in skip_keywords)
-        if not is_header and line.strip():
-            data_start = i
-            break
-
-    data = []
-    for line in lines[data_start:]:
-        if line.strip():
-            try:
-                values = [float(x) for x in line.split()]
-                if len(values) > 0:
-                    data.append(values)
-            except ValueError:
-                continue
-    return np.array(data)
-
-def datetime_to_hour_of_year(month, day, hour, year=2024):
-    start = datetime(year, 1, 1)
-    target = datetime(year, month, day, hour)
-    return max(0, int((target - start).total_seconds() / 3600) - 1)
-
-radiance_data = parse_annual_ill_file("../edificio/results/dc/annual_validation.ill")
+radiance_data = load_annual_ill("../edificio/results/dc/annual_validation.ill")
 hour_idx = datetime_to_hour_of_year(6, 26, 12)
 rad_12h_1d = radiance_data[hour_idx, :]
 
@@ -86,58 +55,30 @@ distancia_entre_sensores = 1.08
 distancia_pizarron = 0.71
 distancia_entre_lineas = 1.08
 
-x_positions = [distancia_muro_norte + i * distancia_entre_sensores for i in range(9)]
-y_positions = [distancia_pizarron + i * distancia_entre_lineas for i in range(7)]
+x_positions = distancia_muro_norte + np.arange(9) * distancia_entre_sensores
+y_positions = distancia_pizarron + np.arange(7) * distancia_entre_lineas
 
-niveles = [0, 299, 500, 1000, 1500, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 10000]
+niveles = (0, 299, 500, 1000, 1500, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 10000)
 
 fig, axes = plt.subplots(2, 3, figsize=(14, 8))
 
-# Experimental raw (no flip)
-ax = axes[0, 0]
 X, Y = np.meshgrid(x_positions, y_positions)
-Z = exp_12h_raw[cols_map].values * 1000
-cf = ax.contourf(X, Y, Z, cmap='jet', levels=niveles)
-ax.contour(X, Y, Z, colors='black', levels=niveles, linewidths=0.5)
-ax.set_title('Exp 12h - RAW (no flip)')
-ax.invert_yaxis()
-ax.set_aspect('equal')
-
-# Experimental reversed
-ax = axes[0, 1]
-Z = exp_12h_raw[cols_map].values[::-1, :] * 1000
-cf = ax.contourf(X, Y, Z, cmap='jet', levels=niveles)
-ax.contour(X, Y, Z, colors='black', levels=niveles, linewidths=0.5)
-ax.set_title('Exp 12h - rows REVERSED')
-ax.invert_yaxis()
-ax.set_aspect('equal')
-
-# Radiance raw (no manipulation)
-ax = axes[1, 0]
-Z = rad_12h_2d
-cf = ax.contourf(X, Y, Z, cmap='jet', levels=niveles)
-ax.contour(X, Y, Z, colors='black', levels=niveles, linewidths=0.5)
-ax.set_title('Rad 12h - RAW reshape(7,9)')
-ax.invert_yaxis()
-ax.set_aspect('equal')
-
-# Radiance with column reversal (N to S)
-ax = axes[1, 1]
-Z = rad_12h_2d[:, ::-1]
-cf = ax.contourf(X, Y, Z, cmap='jet', levels=niveles)
-ax.contour(X, Y, Z, colors='black', levels=niveles, linewidths=0.5)
-ax.set_title('Rad 12h - cols REVERSED')
-ax.invert_yaxis()
-ax.set_aspect('equal')
-
-# Radiance with both reversals
-ax = axes[1, 2]
-Z = rad_12h_2d[::-1, ::-1]
-cf = ax.contourf(X, Y, Z, cmap='jet', levels=niveles)
-ax.contour(X, Y, Z, colors='black', levels=niveles, linewidths=0.5)
-ax.set_title('Rad 12h - BOTH reversed')
-ax.invert_yaxis()
-ax.set_aspect('equal')
+exp_12h = exp_12h_raw[cols_map].values * 1000
+
+# Filled contours only: these panels are for checking orientation, and the
+# shared level boundaries already show where each band starts
+panels = [
+    (axes[0, 0], exp_12h, 'Exp 12h - RAW (no flip)'),
+    (axes[0, 1], exp_12h[::-1, :], 'Exp 12h - rows REVERSED'),
+    (axes[1, 0], rad_12h_2d, 'Rad 12h - RAW reshape(7,9)'),                # no manipulation
+    (axes[1, 1], rad_12h_2d[:, ::-1], 'Rad 12h - cols REVERSED'),          # N to S
+    (axes[1, 2], rad_12h_2d[::-1, ::-1], 'Rad 12h - BOTH reversed'),
+]
+for ax, Z, title in panels:
+    cf = ax.contourf(X, Y, Z, cmap='jet', levels=niveles, antialiased=False)
+    ax.set_title(title)
+    ax.invert_yaxis()
+    ax.set_aspect('equal')
 
 # Hide unused subplot
 axes[0, 2].axis('off')
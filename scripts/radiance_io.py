@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Shared data loading for the validation scripts.
+
+Reads the Radiance annual .ill results (through edificio/ill_io.py) and
+the experimental sensor CSVs.
+Run the scripts from scripts/ and import with
+`from radiance_io import load_annual_ill, datetime_to_hour_of_year`.
+"""
+
+import calendar
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# The .ill parser and its .npy sidecar cache are shared with the edificio scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'edificio'))
+from ill_io import parse_annual_ill_file, load_annual_ill
+
+# Experimental sensor columns, north-side then south-side sensors
+COLS_MAP = ['I1N', 'I2N', 'I3N', 'I4N', 'I1S', 'I2S', 'I3S', 'I4S', 'I5S']
+
+# Days before the first of each month, non-leap year
+DAYS_BEFORE_MONTH = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+# Validation grid: 7 lines (east to west) x 9 sensors (south to north)
+NX = 7
+NY = 9
+
+
+def datetime_to_hour_of_year(month, day, hour, year=2024):
+    """Convert date/time to hour of year index (0-8759)"""
+    days = DAYS_BEFORE_MONTH[month - 1] + day - 1
+    if month > 2 and calendar.isleap(year):
+        days += 1
+    # Use interval ending at requested time
+    return max(0, days * 24 + hour - 1)
+
+
+def load_experimental_data(base_path, hours, reverse_odd_hours=True, dtype=np.float64):
+    """Load experimental data from CSV files as a (hours, 7, 9) array in lux"""
+    arrays = []
+    for hour in hours:
+        # Only the sensor columns are parsed
+        df = pd.read_csv(f"{base_path}/{hour:02d}h.csv", usecols=COLS_MAP, dtype=dtype)
+        arr = df[COLS_MAP].to_numpy()
+        # Reverse odd hours to match coordinate system (a view, no copy)
+        if reverse_odd_hours and hour % 2 == 1:
+            arr = arr[::-1]
+        arrays.append(arr)
+
+    if not arrays:
+        return np.empty((0, NX, NY), dtype=dtype)
+    return np.stack(arrays) * 1000  # Convert klux to lux
+
+
+def load_radiance_data(radiance_data, month, day, hours):
+    """Extract radiance data for a date and hours as a (hours, NX, NY) array"""
+    idxs = [datetime_to_hour_of_year(month, day, hour) for hour in hours]
+    # Reverse Y direction to match N to S
+    return radiance_data[idxs].reshape(len(hours), NX, NY)[:, :, ::-1]